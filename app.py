@@ -1,16 +1,37 @@
+# Monkey-patch as early as possible so requests/urllib3/socket become
+# cooperative under the gevent worker (no-op when gevent isn't installed)
+try:
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:
+    pass
+
 import os
-import math
+import io
+import base64
+import bisect
+import hashlib
+import hmac
+import itertools
+import queue
+import re
+import tempfile
+import threading
 import uuid
+import random
 import logging
 import asyncio
 import aiohttp
+import orjson
 import requests
 import time
-from flask import Flask, request, Response, abort, jsonify, stream_with_context
+from flask import Flask, request, Response, abort, send_file, stream_with_context
+from flask.json.provider import JSONProvider
 from telebot import TeleBot, types, apihelper
-from io import BytesIO
+from collections import OrderedDict
 from urllib.parse import urlparse
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -18,7 +39,16 @@ from urllib3.util.retry import Retry
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson (faster than stdlib json)"""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Configuration
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -27,6 +57,23 @@ UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
 PORT = int(os.getenv('PORT', 5000))
 BASE_URL = os.getenv('BASE_URL', f'http://localhost:{PORT}')
 KOYEB_SERVICE_URL = os.getenv('KOYEB_SERVICE_URL', BASE_URL)
+DOWNLOAD_PREFIX = f"{BASE_URL}/download/"
+_TOKEN_BYTES = TELEGRAM_BOT_TOKEN.encode() if TELEGRAM_BOT_TOKEN else b''
+
+# Create the upload dir once here instead of check-then-create (a TOCTOU
+# race and two extra syscalls) on every request
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+def _short_id():
+    """22-char urlsafe file id - same entropy as a uuid4, 40% smaller key"""
+    return base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b'=').decode()
+
+@lru_cache(maxsize=4096)
+def human_size(n):
+    """Format a byte count as MB/GB for user-facing messages"""
+    if n < 1 << 30:
+        return f"{n / 1048576:.2f} MB"
+    return f"{n / 1073741824:.2f} GB"
 
 # Validate required environment variables
 if not TELEGRAM_BOT_TOKEN:
@@ -39,26 +86,30 @@ if not TELEGRAM_CHAT_ID:
 
 # Configure network reliability
 def setup_network_reliability():
-    """Configure network settings for better reliability"""
+    """Build the shared keep-alive session and wire it into telebot"""
     retry_strategy = Retry(
         total=3,
         backoff_factor=1,
         status_forcelist=[429, 500, 502, 503, 504],
         allowed_methods=["GET", "POST"]
     )
-    
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+
+    # Pooled adapter: concurrent workers reuse warm connections to
+    # api.telegram.org instead of paying a TCP+TLS handshake per call
+    adapter = HTTPAdapter(max_retries=retry_strategy,
+                          pool_connections=32, pool_maxsize=64)
     session = requests.Session()
     session.mount("https://", adapter)
     session.mount("http://", adapter)
-    
+
     apihelper.requests_session = session
     apihelper.READ_TIMEOUT = 30
     apihelper.CONNECT_TIMEOUT = 10
-    
+
     logger.info("Network reliability configured")
+    return session
 
-setup_network_reliability()
+HTTP_SESSION = setup_network_reliability()
 
 # Initialize bot
 try:
@@ -68,13 +119,118 @@ except Exception as e:
     logger.error(f"Failed to create bot instance: {e}")
     bot = None
 
-# In-memory storage for file metadata
-file_metadata = {}
+# Resolve the bot identity once at startup so /health doesn't hit
+# api.telegram.org on every load-balancer probe
+BOT_IDENTITY = None
+
+class LRUCache:
+    """Bounded mapping for file metadata with least-recently-used eviction.
+
+    Evicted entries keep their on-disk/Telegram data; only the in-RAM
+    index entry is dropped, so RSS stays predictable.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._data:
+            self._data.move_to_end(key)
+        elif len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = value
+
+    def get(self, key, default=None):
+        if key in self._data:
+            return self[key]
+        return default
+
+    def items(self):
+        return self._data.items()
+
+# In-memory storage for file metadata (bounded - oldest entries evicted)
+MAX_TRACKED_FILES = int(os.getenv('MAX_TRACKED_FILES', 200))
+file_metadata = LRUCache(MAX_TRACKED_FILES)
 MAX_CHUNK_SIZE = 1.9 * 1024 * 1024 * 1024  # 1.9GB (Telegram limit)
-user_states = {}  # For tracking user conversations
+# Per-read size for streaming loops; multi-MB reads cut the Python-level
+# iteration overhead per GB by ~1000x versus the old 8 KiB chunks.
+# Tunable per deployment - small dynos may prefer a lower ceiling
+STREAM_CHUNK = int(os.getenv('STREAM_CHUNK', 8 * 1024 * 1024))
+
+class TTLDict:
+    """Bounded dict with per-entry expiry for tracking user conversations.
+
+    Entries expire after `ttl` seconds and the oldest entry is evicted once
+    `maxsize` is reached, so stale conversation state can't grow unbounded.
+    """
+    def __init__(self, maxsize=10000, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def set(self, key, value, ttl=None):
+        if key in self._data:
+            self._data.move_to_end(key)
+        elif len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = (value, time.time() + (ttl or self.ttl))
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, expiry = entry
+        if time.time() > expiry:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        if entry is None or time.time() > entry[1]:
+            return default
+        return entry[0]
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+user_states = TTLDict()  # For tracking user conversations
+
+# Retry settings (tunable via environment)
+RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', 0.25))
+RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', 8))
+RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', 3))
+
+_RETRY_AFTER_RE = re.compile(r'retry after (\d+)', re.IGNORECASE)
+
+def _telegram_retry_after(exc):
+    """Pull Telegram's retry_after out of an exception, if it carries one.
+
+    pyTelegramBotAPI attaches the API's JSON body to ApiException as
+    result_json; fall back to scraping the message text.
+    """
+    result_json = getattr(exc, 'result_json', None)
+    if isinstance(result_json, dict):
+        retry_after = (result_json.get('parameters') or {}).get('retry_after')
+        if isinstance(retry_after, int):
+            return retry_after
+    match = _RETRY_AFTER_RE.search(str(exc))
+    return int(match.group(1)) if match else None
 
 # Retry decorator for Telegram API calls
-def retry_telegram_api(max_retries=3, delay=2):
+def retry_telegram_api(max_retries=RETRY_MAX_ATTEMPTS, base=RETRY_BASE_DELAY):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -83,18 +239,24 @@ def retry_telegram_api(max_retries=3, delay=2):
                     return func(*args, **kwargs)
                 except Exception as e:
                     error_msg = str(e)
-                    if ("A request to the Telegram API was unsuccessful" in error_msg or 
-                        "Conflict" in error_msg or 
+                    if ("A request to the Telegram API was unsuccessful" in error_msg or
+                        "Conflict" in error_msg or
                         "timed out" in error_msg.lower()):
                         if attempt < max_retries - 1:
-                            logger.warning(f"Telegram API attempt {attempt + 1} failed, retrying in {delay}s...")
-                            time.sleep(delay)
+                            # Honor Telegram's retry_after hint when present,
+                            # otherwise exponential backoff with jitter
+                            retry_after = _telegram_retry_after(e)
+                            if retry_after is not None:
+                                wait = retry_after + random.uniform(0, 1)
+                            else:
+                                wait = min(RETRY_MAX_DELAY, base * (2 ** attempt)) * random.uniform(0.5, 1.5)
+                            logger.warning(f"Telegram API attempt {attempt + 1} failed, retrying in {wait:.1f}s...")
+                            time.sleep(wait)
                         else:
                             logger.error(f"All {max_retries} attempts failed: {error_msg}")
                             raise
                     else:
                         raise
-            return func(*args, **kwargs)
         return wrapper
     return decorator
 
@@ -115,6 +277,32 @@ def safe_send_message(chat_id, text, **kwargs):
 def safe_get_me():
     return bot.get_me()
 
+if bot:
+    try:
+        BOT_IDENTITY = safe_get_me().username
+        logger.info(f"Bot identity resolved: {BOT_IDENTITY}")
+    except Exception as e:
+        logger.warning(f"Could not resolve bot identity at startup: {e}")
+
+# TTL caches for the identity/webhook probes: frequent health or debug
+# polling costs at most one Telegram round-trip per minute
+_me_cache = {'t': 0, 'v': None}
+_webhook_info_cache = {'t': 0, 'v': None}
+
+def cached_me(ttl=60):
+    now = time.time()
+    if now - _me_cache['t'] > ttl:
+        _me_cache['v'] = safe_get_me()
+        _me_cache['t'] = now
+    return _me_cache['v']
+
+def cached_webhook_info(ttl=60):
+    now = time.time()
+    if now - _webhook_info_cache['t'] > ttl:
+        _webhook_info_cache['v'] = bot.get_webhook_info()
+        _webhook_info_cache['t'] = now
+    return _webhook_info_cache['v']
+
 def setup_webhook():
     """Set up Telegram webhook"""
     if not bot:
@@ -137,12 +325,12 @@ def setup_webhook():
 # Webhook endpoint
 @app.route('/webhook/<path:token>', methods=['POST'])
 def webhook(token):
-    if token != TELEGRAM_BOT_TOKEN:
+    # Constant-time compare against the precomputed token bytes
+    if not hmac.compare_digest(token.encode(), _TOKEN_BYTES):
         abort(403)
     
     if request.headers.get('content-type') == 'application/json':
-        json_string = request.get_data().decode('utf-8')
-        update = types.Update.de_json(json_string)
+        update = types.Update.de_json(orjson.loads(request.get_data()))
         bot.process_new_updates([update])
         return ''
     return 'Invalid content type', 403
@@ -172,8 +360,9 @@ I can help you store **HUGE files** (up to 10GB+) in Telegram and generate direc
 @bot.message_handler(commands=['upload'])
 def handle_upload_command(message):
     """Handle the upload command"""
-    if len(message.text.split()) > 1:
-        url = message.text.split()[1]
+    _, _, url = message.text.partition(' ')
+    url = url.strip()
+    if url:
         handle_url_upload(message, url)
     else:
         user_states[message.chat.id] = 'awaiting_url'
@@ -188,9 +377,8 @@ def handle_list_command(message):
     
     response = "📁 **Your Stored Files:**\n\n"
     for i, (file_id, metadata) in enumerate(list(file_metadata.items())[:10]):
-        size_gb = metadata['size'] / (1024 * 1024 * 1024)
-        response += f"• **{metadata['filename']}** ({size_gb:.2f} GB)\n"
-        response += f"  🔗 Download: {BASE_URL}/download/{file_id}\n\n"
+        response += f"• **{metadata['filename']}** ({human_size(metadata['size'])})\n"
+        response += f"  🔗 Download: {DOWNLOAD_PREFIX}{file_id}\n\n"
     
     if len(file_metadata) > 10:
         response += f"📦 ... and {len(file_metadata) - 10} more files."
@@ -201,14 +389,102 @@ def handle_list_command(message):
 def handle_url_response(message):
     """Handle URL response for upload"""
     url = message.text
-    user_states[message.chat.id] = None
+    user_states.pop(message.chat.id)
     handle_url_upload(message, url)
 
 def handle_url_upload(message, url):
-    """Process URL upload"""
+    """Validate the URL and hand the transfer to the worker pool"""
+    parsed = urlparse(url)
+    if not (parsed.scheme and parsed.netloc):
+        safe_send_message(message.chat.id, "❌ That doesn't look like a valid URL. Please try again.")
+        return
+
     safe_send_message(message.chat.id, "📥 Downloading file from URL...")
-    # Implementation would go here
-    safe_send_message(message.chat.id, f"🌐 Received URL: {url}\n\nThis feature would process large files from URLs.")
+    EXECUTOR.submit(_process_url_upload, message, parsed, url)
+
+# URL dedup: ingesting the same URL twice should cost zero bytes over
+# the wire the second time. Keyed by a short blake2b digest; bounded so
+# it cannot outgrow the metadata map it points into.
+_url_cache = LRUCache(MAX_TRACKED_FILES)
+
+def _url_key(url):
+    return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+def _process_url_upload(message, parsed, url):
+    """Download a file from a URL and store it in Telegram (worker thread)"""
+    filename = os.path.basename(parsed.path) or f"file_{uuid.uuid4().hex[:8]}"
+    temp_path = os.path.join(UPLOAD_FOLDER, f"{uuid.uuid4().hex}_{filename}")
+
+    # Same URL already ingested and still tracked: hand back the
+    # existing link without touching the network
+    url_key = _url_key(url)
+    if url_key in _url_cache:
+        cached_id = _url_cache[url_key]
+        if cached_id in file_metadata:
+            meta = file_metadata[cached_id]
+            safe_send_message(
+                message.chat.id,
+                f"♻️ Already stored as **{meta['filename']}** "
+                f"({human_size(meta['size'])})\n"
+                f"🔗 **Download URL:** {DOWNLOAD_PREFIX}{cached_id}",
+                parse_mode='Markdown')
+            return
+
+    try:
+        # Files that fit in one Telegram document relay straight from the
+        # origin into sendDocument - no disk staging, half the container
+        # I/O. Anything bigger (or of unknown size) takes the staged path
+        # below, which also covers origins that break mid-transfer.
+        relayed = None
+        try:
+            relayed = asyncio.run_coroutine_threadsafe(
+                _relay_url_to_telegram(url, filename, get_aiohttp_session()),
+                BG_LOOP).result(timeout=3600)
+        except Exception as e:
+            logger.warning(f"Direct relay of {url} failed, staging to disk: {e}")
+
+        if relayed is not None:
+            telegram_file_id, file_size = relayed
+            chunk_count = 1
+            file_id = _short_id()
+            file_metadata[file_id] = {
+                'filename': filename,
+                'size': file_size,
+                'upload_time': time.time(),
+                'chunk_count': 1,
+                'telegram_file_id': telegram_file_id,
+            }
+        else:
+            future = asyncio.run_coroutine_threadsafe(
+                download_file_from_url(url, temp_path, get_aiohttp_session()), BG_LOOP)
+            if not future.result(timeout=3600):
+                safe_send_message(message.chat.id, "❌ Failed to download file from URL. Please check the link.")
+                return
+
+            safe_send_message(message.chat.id, "⚙️ Processing your file...")
+            file_id, file_size, chunk_count = process_uploaded_file(temp_path, filename)
+
+            # Keep the downloaded file where it landed and remember the
+            # path: downloads on this instance are then served straight
+            # off local disk via send_file, with Telegram as the durable
+            # copy
+            file_metadata[file_id]['path'] = temp_path
+
+        _url_cache[url_key] = file_id
+        success_text = f"""
+✅ **File successfully stored!**
+
+📁 **File:** {filename}
+📊 **Size:** {human_size(file_size)}
+🧩 **Chunks:** {chunk_count}
+🔗 **Download URL:** {DOWNLOAD_PREFIX}{file_id}
+        """
+        safe_send_message(message.chat.id, success_text, parse_mode='Markdown')
+    except Exception as e:
+        logger.error(f"Error uploading from URL {url}: {e}")
+        safe_send_message(message.chat.id, f"❌ Error processing URL: {str(e)}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
 @bot.message_handler(content_types=['document'])
 def handle_document(message):
@@ -218,7 +494,7 @@ def handle_document(message):
         file_size = message.document.file_size or 0
         
         # Generate a unique file ID
-        file_id = str(uuid.uuid4())
+        file_id = _short_id()
         
         # Store minimal metadata (we won't download large files via bot)
         file_metadata[file_id] = {
@@ -229,18 +505,12 @@ def handle_document(message):
             'chunk_count': 1  # Single file for now
         }
         
-        # Calculate size in appropriate units
-        if file_size > 1024 * 1024 * 1024:
-            size_display = f"{file_size / (1024 * 1024 * 1024):.2f} GB"
-        else:
-            size_display = f"{file_size / (1024 * 1024):.2f} MB"
-        
         success_text = f"""
 ✅ **File received successfully!**
 
 📁 **File:** {file_name}
-📊 **Size:** {size_display}
-🔗 **Download URL:** {BASE_URL}/download/{file_id}
+📊 **Size:** {human_size(file_size)}
+🔗 **Download URL:** {DOWNLOAD_PREFIX}{file_id}
 
 ⚡ **Note:** For very large files, the download link will stream directly from Telegram's servers.
         """
@@ -250,31 +520,383 @@ def handle_document(message):
         logger.error(f"Error processing file: {e}")
         safe_send_message(message.chat.id, f"❌ Error processing file: {str(e)}")
 
-def download_from_telegram(file_id, telegram_file_id):
+# Worker pool for download/processing jobs so webhook handlers can return
+# immediately instead of blocking bot.process_new_updates for minutes
+EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='tg-dl')
+
+# One asyncio loop runs for the life of the process in a daemon thread;
+# request handlers submit coroutines to it instead of spinning up (and
+# leaking) a fresh event loop per call
+BG_LOOP = asyncio.new_event_loop()
+threading.Thread(target=BG_LOOP.run_forever, daemon=True, name='aio-loop').start()
+
+AIOHTTP_SESSION = None
+_aiohttp_session_lock = threading.Lock()
+
+def _new_aiohttp_session():
+    # Must run on BG_LOOP: the session binds to the current event loop
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=30,
+                                       ttl_dns_cache=300, keepalive_timeout=75)
+    )
+
+async def _make_aiohttp_session():
+    return _new_aiohttp_session()
+
+def get_aiohttp_session():
+    """Lazily create the shared ClientSession on the background loop.
+
+    Safe to call both from worker threads and from coroutines already
+    running on BG_LOOP - the first would deadlock if it awaited itself.
+    """
+    global AIOHTTP_SESSION
+    if AIOHTTP_SESSION is None:
+        with _aiohttp_session_lock:
+            if AIOHTTP_SESSION is None:
+                try:
+                    on_bg_loop = asyncio.get_running_loop() is BG_LOOP
+                except RuntimeError:
+                    on_bg_loop = False
+                if on_bg_loop:
+                    AIOHTTP_SESSION = _new_aiohttp_session()
+                else:
+                    AIOHTTP_SESSION = asyncio.run_coroutine_threadsafe(
+                        _make_aiohttp_session(), BG_LOOP).result(timeout=30)
+    return AIOHTTP_SESSION
+
+async def download_file_from_url(url, file_path, session, max_resumes=3):
+    """Stream a remote URL to disk through the shared aiohttp session.
+
+    Transient socket errors mid-transfer resume with a Range request
+    from the last byte written rather than restarting - the dominant
+    failure mode on multi-gigabyte pulls is a single dropped connection.
+    """
+    written = 0
+    attempts = 0
+    with open(file_path, 'wb') as f:
+        while True:
+            headers = {'Range': f'bytes={written}-'} if written else {}
+            try:
+                async with session.get(url, headers=headers) as resp:
+                    if written and resp.status == 206:
+                        pass
+                    elif resp.status == 200:
+                        if written:
+                            # Server ignored the Range header; start over
+                            f.seek(0)
+                            f.truncate()
+                            written = 0
+                    else:
+                        logger.error(f"Failed to download {url}: HTTP {resp.status}")
+                        return False
+                    async for chunk in resp.content.iter_chunked(STREAM_CHUNK):
+                        f.write(chunk)
+                        written += len(chunk)
+                return True
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                attempts += 1
+                if attempts > max_resumes:
+                    logger.error(f"Download of {url} failed after {attempts} attempts: {e}")
+                    return False
+                logger.warning(f"Download of {url} interrupted at byte {written}, resuming: {e}")
+
+async def _relay_url_to_telegram(url, filename, session):
+    """Pipe a remote URL straight into sendDocument without disk staging.
+
+    Returns (telegram_file_id, size) when the origin reports a
+    Content-Length that fits in a single Telegram document; returns None
+    to tell the caller to fall back to the staged download path (size
+    unknown, or large enough to need splitting).
+    """
+    async with session.get(url) as resp:
+        if resp.status != 200:
+            raise RuntimeError(f"HTTP {resp.status} from origin")
+        size = resp.content_length
+        if not size or size > MAX_CHUNK_SIZE:
+            return None
+        form = aiohttp.FormData()
+        form.add_field('chat_id', str(TELEGRAM_CHAT_ID))
+        # aiohttp wraps the StreamReader in an async payload, so bytes go
+        # origin -> Telegram without ever touching the container's disk
+        form.add_field('document', resp.content, filename=filename,
+                       content_type='application/octet-stream')
+        api = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendDocument"
+        async with session.post(api, data=form,
+                                timeout=aiohttp.ClientTimeout(total=3600, connect=60)) as tg:
+            payload = orjson.loads(await tg.read())
+    if not payload.get('ok'):
+        raise RuntimeError(f"sendDocument failed for {filename}: {payload}")
+    return payload['result']['document']['file_id'], size
+
+class _FileSlice(io.RawIOBase):
+    """Read-only view of bytes [offset, offset+length) of an open fd.
+
+    Handed to aiohttp as an upload payload so oversized files upload
+    each part straight from the source file via os.pread - no .partN
+    staging copies, no 2 GiB buffers. pread is positional, so several
+    slices of the same fd can upload concurrently.
+    """
+
+    def __init__(self, fd, offset, length):
+        self._fd = fd
+        self._offset = offset
+        self._length = length
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        remaining = self._length - self._pos
+        if remaining <= 0:
+            return 0
+        data = os.pread(self._fd, min(len(b), remaining), self._offset + self._pos)
+        n = len(data)
+        b[:n] = data
+        self._pos += n
+        return n
+
+    def read(self, size=-1):
+        remaining = self._length - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b''
+        data = os.pread(self._fd, size, self._offset + self._pos)
+        self._pos += len(data)
+        return data
+
+async def _upload_part(session, semaphore, part_slice, part_name):
+    """POST one part to sendDocument; returns Telegram's document file_id"""
+    async with semaphore:
+        form = aiohttp.FormData()
+        form.add_field('chat_id', str(TELEGRAM_CHAT_ID))
+        form.add_field('document', part_slice, filename=part_name)
+        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendDocument"
+        async with session.post(url, data=form,
+                                timeout=aiohttp.ClientTimeout(total=3600, connect=60)) as resp:
+            payload = orjson.loads(await resp.read())
+    if not payload.get('ok'):
+        raise RuntimeError(f"sendDocument failed for {part_name}: {payload}")
+    return payload['result']['document']['file_id']
+
+def process_uploaded_file(file_path, file_name):
+    """Store a local file in Telegram, splitting oversized files into chunks.
+
+    Parts are read directly out of the source file with positional reads
+    and upload concurrently (at most 4 in flight) - no intermediate
+    .partN files ever touch disk. Returns (file_id, file_size, chunk_count).
+    """
+    file_size = os.path.getsize(file_path)
+    part_size = int(MAX_CHUNK_SIZE)
+    offsets = range(0, file_size, part_size) if file_size else [0]
+    parts = [(i + 1, off, min(part_size, file_size - off))
+             for i, off in enumerate(offsets)]
+
+    fd = os.open(file_path, os.O_RDONLY)
+
+    async def _upload_all():
+        semaphore = asyncio.Semaphore(4)
+        session = get_aiohttp_session()
+        return await asyncio.gather(*[
+            _upload_part(session, semaphore, _FileSlice(fd, offset, length),
+                         f"{file_name}.part{part_number}" if len(parts) > 1 else file_name)
+            for part_number, offset, length in parts
+        ])
+
+    try:
+        # Submit to the persistent background loop - building a selector,
+        # signal handlers and a fresh event loop per upload is pure waste
+        telegram_ids = asyncio.run_coroutine_threadsafe(_upload_all(), BG_LOOP).result(timeout=3600)
+    finally:
+        os.close(fd)
+
+    file_id = _short_id()
+    metadata = {
+        'filename': file_name,
+        'size': file_size,
+        'upload_time': time.time(),
+        'chunk_count': len(parts)
+    }
+    if len(parts) == 1:
+        metadata['telegram_file_id'] = telegram_ids[0]
+    else:
+        metadata['chunks'] = [
+            {'part': part_number, 'telegram_file_id': tg_id, 'size': part_size}
+            for (part_number, _, part_size), tg_id in zip(parts, telegram_ids)
+        ]
+        # Prefix sums of part sizes: range requests bisect straight to
+        # the first intersecting part instead of walking the list
+        metadata['offsets'] = list(itertools.accumulate(
+            (p[2] for p in parts), initial=0))
+    file_metadata[file_id] = metadata
+    return file_id, file_size, len(parts)
+
+# Disk cache tier: recently streamed Telegram files are kept locally so a
+# repeat download becomes a local sendfile instead of a full re-fetch
+CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(UPLOAD_FOLDER, 'cache'))
+MAX_DISK_CACHE_BYTES = int(os.getenv('MAX_DISK_CACHE_BYTES', 2 * 1024 * 1024 * 1024))
+os.makedirs(CACHE_DIR, exist_ok=True)
+_disk_cache = OrderedDict()  # tg_file_id -> (path, size)
+_disk_cache_total = 0
+_disk_cache_lock = threading.Lock()
+_disk_cache_fills = {}  # tg_file_id -> Lock held while a fill is in flight
+
+def disk_cache_get(telegram_file_id):
+    """Return the cached local path for a Telegram file, or None"""
+    with _disk_cache_lock:
+        entry = _disk_cache.get(telegram_file_id)
+        if entry is None:
+            return None
+        path, size = entry
+        if not os.path.exists(path):
+            del _disk_cache[telegram_file_id]
+            return None
+        _disk_cache.move_to_end(telegram_file_id)
+        return path
+
+def disk_cache_put(telegram_file_id, part_path, size):
+    """Atomically admit a completed .part file and evict LRU entries over cap"""
+    global _disk_cache_total
+    final_path = os.path.join(CACHE_DIR, telegram_file_id)
+    os.replace(part_path, final_path)
+    with _disk_cache_lock:
+        _disk_cache[telegram_file_id] = (final_path, size)
+        _disk_cache.move_to_end(telegram_file_id)
+        _disk_cache_total += size
+        while _disk_cache_total > MAX_DISK_CACHE_BYTES and len(_disk_cache) > 1:
+            _, (old_path, old_size) = _disk_cache.popitem(last=False)
+            _disk_cache_total -= old_size
+            try:
+                os.unlink(old_path)
+            except OSError:
+                pass
+
+def disk_cache_fill_lock(telegram_file_id):
+    """Non-blocking per-key lock so concurrent requests don't double-fill"""
+    with _disk_cache_lock:
+        lock = _disk_cache_fills.setdefault(telegram_file_id, threading.Lock())
+    return lock if lock.acquire(blocking=False) else None
+
+# Telegram file_path results are valid for about an hour; cache them so
+# repeat downloads skip the getFile round-trip entirely
+FILE_PATH_TTL = 55 * 60
+_file_path_cache = {}
+
+def get_cached_file_path(telegram_file_id):
+    entry = _file_path_cache.get(telegram_file_id)
+    if entry and time.time() < entry[1]:
+        return entry[0]
+    return None
+
+def cache_file_path(telegram_file_id, file_path):
+    _file_path_cache[telegram_file_id] = (file_path, time.time() + FILE_PATH_TTL)
+
+async def resolve_chunks(telegram_file_ids):
+    """Resolve many telegram file_ids to file_paths concurrently.
+
+    Fans the getFile calls out over the shared aiohttp session (capped
+    at 16 in flight) instead of N serial round-trips to api.telegram.org;
+    keep-alive means successive fan-outs skip the TLS handshake too.
+    """
+    semaphore = asyncio.Semaphore(16)
+
+    async def resolve_one(session, tg_id):
+        cached = get_cached_file_path(tg_id)
+        if cached:
+            return cached
+        async with semaphore:
+            url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getFile?file_id={tg_id}"
+            async with session.get(url) as resp:
+                payload = orjson.loads(await resp.read())
+        if not payload.get('ok'):
+            raise RuntimeError(f"getFile failed for {tg_id}: {payload}")
+        file_path = payload['result']['file_path']
+        cache_file_path(tg_id, file_path)
+        return file_path
+
+    session = get_aiohttp_session()
+    return await asyncio.gather(*[resolve_one(session, fid) for fid in telegram_file_ids])
+
+# Single-group match beats the partition/strip/int dance on the Range
+# hot path - streaming clients issue many small range requests per file
+_RANGE_HEADER_RE = re.compile(r'bytes=(\d*)-(\d*)\s*$')
+
+def parse_range(header, size):
+    """Parse a 'Range: bytes=start-end' header into (start, end) or None"""
+    if not header:
+        return None
+    m = _RANGE_HEADER_RE.match(header.strip())
+    if m is None:
+        return None
+    start_s, end_s = m.groups()
+    if start_s:
+        start = int(start_s)
+        end = int(end_s) if end_s else size - 1
+    elif end_s:
+        # Suffix range: last N bytes
+        start = max(0, size - int(end_s))
+        end = size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        return None
+    return start, min(end, size - 1)
+
+def download_from_telegram(file_id, telegram_file_id, range_header=None):
     """Download a file from Telegram and stream it to the client"""
     try:
-        # Get the file info from Telegram
-        file_info = safe_get_file(telegram_file_id)
-        telegram_file_url = f"https://api.telegram.org/file/bot{TELEGRAM_BOT_TOKEN}/{file_info.file_path}"
-        
+        # Get the file info from Telegram (cached for repeat downloads)
+        file_path = get_cached_file_path(telegram_file_id)
+        if file_path is None:
+            file_path = safe_get_file(telegram_file_id).file_path
+            cache_file_path(telegram_file_id, file_path)
+        telegram_file_url = f"https://api.telegram.org/file/bot{TELEGRAM_BOT_TOKEN}/{file_path}"
+
         # Stream the file from Telegram with authentication
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        
+        if range_header:
+            # Telegram's file CDN honors byte-range requests
+            headers['Range'] = range_header
+
         # Make a request to Telegram with the bot token for authentication
-        response = requests.get(telegram_file_url, stream=True, headers=headers)
-        
-        if response.status_code != 200:
+        response = HTTP_SESSION.get(telegram_file_url, stream=True, headers=headers)
+
+        if response.status_code not in (200, 206):
             logger.error(f"Failed to download from Telegram: {response.status_code}")
             return None
-        
+
         return response
-        
+
     except Exception as e:
         logger.error(f"Error downloading from Telegram: {e}")
         return None
 
+# When a reverse proxy fronts the app, local file bodies can be handed
+# to nginx entirely: X_ACCEL_PREFIX names an internal location mapped to
+# UPLOAD_FOLDER, and nginx then streams the file via sendfile(2) with
+# Python out of the data path. Unset (the default) keeps send_file.
+X_ACCEL_PREFIX = os.getenv('X_ACCEL_PREFIX')
+
+def serve_local_file(path, filename):
+    """Serve a file on local disk, delegating the body to nginx if configured"""
+    if X_ACCEL_PREFIX:
+        rel = os.path.relpath(path, UPLOAD_FOLDER)
+        if not rel.startswith('..'):
+            return Response(b'', mimetype='application/octet-stream', headers={
+                'X-Accel-Redirect': f"{X_ACCEL_PREFIX.rstrip('/')}/{rel}",
+                'Content-Disposition': f'attachment; filename="{filename}"',
+            })
+    return send_file(
+        path,
+        mimetype='application/octet-stream',
+        download_name=filename,
+        as_attachment=True,
+        conditional=True
+    )
+
 @app.route('/download/<file_id>', methods=['GET'])
 def download_file(file_id):
     """Download a file - either from memory or stream from Telegram"""
@@ -283,44 +905,197 @@ def download_file(file_id):
     
     metadata = file_metadata[file_id]
     filename = metadata['filename']
-    
-    # If we have the file content in memory (small files)
-    if 'content' in metadata:
+    size = metadata['size']
+    requested_range = parse_range(request.headers.get('Range'), size)
+    # Stable per-file validator so browsers and download managers can
+    # safely resume and stitch cached ranges together across requests
+    etag = '"%s"' % hashlib.sha256(f'{file_id}:{size}'.encode()).hexdigest()[:16]
+
+    # Disk-backed files: nginx takes the body when X_ACCEL_PREFIX is set;
+    # otherwise Werkzeug handles ranges/conditional headers and hands the
+    # fd to the WSGI server's file_wrapper (sendfile on Linux)
+    if 'path' in metadata and os.path.exists(metadata['path']):
+        return serve_local_file(metadata['path'], filename)
+    # Multi-chunk files reassemble from several Telegram documents; a
+    # bounded producer thread keeps the next part's connection warm while
+    # the current one streams to the client
+    elif 'chunks' in metadata:
+        chunks = metadata['chunks']
+
+        # Work out which parts the requested byte range crosses and the
+        # inner range to ask Telegram for within the first/last of them,
+        # so a resume near the end doesn't re-stream earlier parts.
+        # Prefix sums recorded at upload let us bisect to the first
+        # intersecting part; files stored before offsets existed get
+        # theirs rebuilt on the fly
+        jobs = []
+        if requested_range:
+            start, end = requested_range
+            offsets = metadata.get('offsets')
+            if offsets is None:
+                offsets = list(itertools.accumulate(
+                    (c['size'] for c in chunks), initial=0))
+            first = bisect.bisect_right(offsets, start) - 1
+            last = min(bisect.bisect_right(offsets, end) - 1, len(chunks) - 1)
+            for idx in range(first, last + 1):
+                chunk_meta = chunks[idx]
+                part_size = chunk_meta['size']
+                inner_start = max(0, start - offsets[idx])
+                inner_end = min(part_size - 1, end - offsets[idx])
+                if inner_start > 0 or inner_end < part_size - 1:
+                    jobs.append((chunk_meta, f'bytes={inner_start}-{inner_end}'))
+                else:
+                    jobs.append((chunk_meta, None))
+        else:
+            jobs = [(chunk_meta, None) for chunk_meta in chunks]
+
+        # Resolve file_paths in one concurrent fan-out up front - but only
+        # for the parts the range actually crosses, so a resume near the
+        # end of a 40-part file costs one getFile instead of forty. The
+        # producer below then hits the warm cache instead of paying a
+        # round-trip between parts. Submitted to the persistent background
+        # loop - no event-loop construction per request
+        try:
+            asyncio.run_coroutine_threadsafe(
+                resolve_chunks([c['telegram_file_id'] for c, _ in jobs]),
+                BG_LOOP).result(timeout=60)
+        except Exception as e:
+            logger.warning(f"Chunk path prefetch failed, falling back to serial getFile: {e}")
+
+        _SENTINEL = object()
+        prefetch = queue.Queue(maxsize=2)
+
+        def producer():
+            try:
+                for chunk_meta, range_header in jobs:
+                    resp = download_from_telegram(file_id, chunk_meta['telegram_file_id'],
+                                                  range_header=range_header)
+                    if resp is None:
+                        raise RuntimeError(f"chunk {chunk_meta['part']} failed to download")
+                    if range_header and resp.status_code != 206:
+                        raise RuntimeError(f"chunk {chunk_meta['part']} ignored range request")
+                    prefetch.put(resp)
+                prefetch.put(_SENTINEL)
+            except Exception as e:
+                prefetch.put(e)
+
+        threading.Thread(target=producer, daemon=True).start()
+
+        def generate():
+            while True:
+                item = prefetch.get()
+                if item is _SENTINEL:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                for chunk in item.iter_content(chunk_size=STREAM_CHUNK):
+                    if chunk:
+                        yield chunk
+
+        headers = {
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Accept-Ranges': 'bytes',
+            'ETag': etag
+        }
+        if requested_range:
+            start, end = requested_range
+            headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+            headers['Content-Length'] = str(end - start + 1)
+            status = 206
+        else:
+            headers['Content-Length'] = str(size)
+            status = 200
+
         return Response(
-            metadata['content'],
+            stream_with_context(generate()),
+            status=status,
             mimetype='application/octet-stream',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"',
-                'Content-Length': str(metadata['size'])
-            }
+            headers=headers,
+            direct_passthrough=True
         )
     # For large files stored in Telegram
     elif 'telegram_file_id' in metadata:
         try:
-            # Stream the file from Telegram
-            telegram_response = download_from_telegram(file_id, metadata['telegram_file_id'])
-            
+            tg_file_id = metadata['telegram_file_id']
+
+            # Serve straight from the local disk cache when we already have it
+            cached_path = disk_cache_get(tg_file_id)
+            if cached_path:
+                return serve_local_file(cached_path, filename)
+
+            # Stream the file from Telegram, forwarding any byte-range request
+            range_header = None
+            if requested_range:
+                start, end = requested_range
+                range_header = f'bytes={start}-{end}'
+            telegram_response = download_from_telegram(file_id, tg_file_id,
+                                                       range_header=range_header)
+
             if telegram_response is None:
                 return {"error": "Failed to download file from Telegram"}, 500
-            
+
+            # Tee full (non-range) downloads into the cache; a non-blocking
+            # per-key lock keeps two parallel requests from both filling
+            fill_lock = None
+            if not requested_range and size <= MAX_DISK_CACHE_BYTES:
+                fill_lock = disk_cache_fill_lock(tg_file_id)
+
             def generate():
-                for chunk in telegram_response.iter_content(chunk_size=8192):
-                    if chunk:
-                        yield chunk
-            
+                if fill_lock:
+                    part_path = os.path.join(CACHE_DIR, f"{tg_file_id}.part")
+                    written = 0
+                    try:
+                        with open(part_path, 'wb') as cache_out:
+                            for chunk in telegram_response.iter_content(chunk_size=STREAM_CHUNK):
+                                if chunk:
+                                    cache_out.write(chunk)
+                                    written += len(chunk)
+                                    yield chunk
+                        if written == size:
+                            disk_cache_put(tg_file_id, part_path, written)
+                        else:
+                            os.unlink(part_path)
+                    except BaseException:
+                        try:
+                            os.unlink(part_path)
+                        except OSError:
+                            pass
+                        raise
+                    finally:
+                        fill_lock.release()
+                else:
+                    for chunk in telegram_response.iter_content(chunk_size=STREAM_CHUNK):
+                        if chunk:
+                            yield chunk
+
+            headers = {
+                'Content-Disposition': f'attachment; filename="{filename}"',
+                'Accept-Ranges': 'bytes',
+                'ETag': etag
+            }
+            # Only advertise a length/range when Telegram actually honored it;
+            # a short-read from the generator must not lie to the client
+            if requested_range and telegram_response.status_code == 206:
+                start, end = requested_range
+                headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+                headers['Content-Length'] = str(end - start + 1)
+                status = 206
+            else:
+                headers['Content-Length'] = str(size)
+                status = 200
+
             return Response(
                 stream_with_context(generate()),
+                status=status,
                 mimetype='application/octet-stream',
-                headers={
-                    'Content-Disposition': f'attachment; filename="{filename}"',
-                    'Content-Length': str(metadata['size'])
-                }
+                headers=headers,
+                direct_passthrough=True
             )
-            
+
         except Exception as e:
             logger.error(f"Error streaming file from Telegram: {e}")
             return {"error": f"Failed to download file: {str(e)}"}, 500
-    
+
     return {"error": "File not available for download"}, 500
 
 @app.route('/upload', methods=['POST'])
@@ -332,17 +1107,21 @@ def upload_file():
     file = request.files['file']
     if file.filename == '':
         return {"error": "No file selected"}, 400
-    
-    # For large files, we might want to stream to disk instead of memory
-    file_content = file.read()
-    file_id = str(uuid.uuid4())
-    file_size = len(file_content)
-    
+
+    # Spool to disk instead of keeping a Python bytes copy - downloads go
+    # out via send_file/sendfile with no file bytes crossing Python space
+    tmp = tempfile.NamedTemporaryFile(dir=UPLOAD_FOLDER, delete=False)
+    file.save(tmp, buffer_size=1024 * 1024)
+    tmp.flush()
+    file_id = _short_id()
+    file_size = os.path.getsize(tmp.name)
+
     # Store metadata
+    tmp.close()
     file_metadata[file_id] = {
         'filename': file.filename,
         'size': file_size,
-        'content': file_content,
+        'path': tmp.name,
         'upload_time': time.time()
     }
     
@@ -351,7 +1130,7 @@ def upload_file():
         "filename": file.filename,
         "size": file_size,
         "message": "File uploaded successfully",
-        "download_url": f"{BASE_URL}/download/{file_id}"
+        "download_url": f"{DOWNLOAD_PREFIX}{file_id}"
     }, 200
 
 @app.route('/files/<file_id>/info', methods=['GET'])
@@ -366,13 +1145,15 @@ def get_file_info(file_id):
         "filename": metadata['filename'],
         "size": metadata['size'],
         "upload_time": metadata['upload_time'],
-        "download_url": f"{BASE_URL}/download/{file_id}"
+        "download_url": f"{DOWNLOAD_PREFIX}{file_id}"
     }
 
 @app.route('/files', methods=['GET'])
 def list_files():
     """List all stored files"""
-    return {
+    # Largest JSON payload we serve - emit orjson bytes directly rather
+    # than going dict -> str -> bytes through the response machinery
+    payload = {
         "count": len(file_metadata),
         "files": [
             {
@@ -380,23 +1161,23 @@ def list_files():
                 "filename": metadata['filename'],
                 "size": metadata['size'],
                 "upload_time": metadata['upload_time'],
-                "download_url": f"{BASE_URL}/download/{file_id}"
+                "download_url": f"{DOWNLOAD_PREFIX}{file_id}"
             }
             for file_id, metadata in file_metadata.items()
         ]
     }
+    return Response(orjson.dumps(payload), mimetype='application/json')
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
-    bot_status = "healthy" if bot else "unhealthy"
-    try:
-        if bot:
-            bot_info = safe_get_me()
-            bot_status = f"healthy - {bot_info.username}"
-    except Exception as e:
-        bot_status = f"unhealthy - {str(e)}"
-    
+    """Health check endpoint - cheap, no Telegram round-trip"""
+    if bot and BOT_IDENTITY:
+        bot_status = f"healthy - {BOT_IDENTITY}"
+    elif bot:
+        bot_status = "healthy"
+    else:
+        bot_status = "unhealthy"
+
     return {
         'status': 'healthy',
         'bot_status': bot_status,
@@ -406,39 +1187,79 @@ def health_check():
         'service': 'Large File Storage Bot'
     }
 
-@app.route('/')
-def home():
-    return {
-        'status': 'online', 
-        'service': 'Large File Storage Bot',
-        'description': 'Store and share files up to 10GB+',
-        'max_file_size': '10GB+ (using Telegram chunks)',
-        'endpoints': {
-            'upload': '/upload',
-            'download': '/download/<file_id>',
-            'file_info': '/files/<file_id>/info',
-            'list_files': '/files',
-            'health': '/health'
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Full readiness check - does a real Telegram API round-trip.
+
+    Point low-frequency probes here; /health stays network-free.
+    """
+    global BOT_IDENTITY
+    if not bot:
+        return {'status': 'not ready', 'bot_status': 'unhealthy'}, 503
+    try:
+        BOT_IDENTITY = cached_me().username
+        return {'status': 'ready', 'bot_status': f'healthy - {BOT_IDENTITY}'}
+    except Exception as e:
+        return {'status': 'not ready', 'bot_status': f'unhealthy - {str(e)}'}, 503
+
+@app.route('/debug/bot', methods=['GET'])
+def debug_bot():
+    """Bot/webhook state for troubleshooting (cached, safe to poll)"""
+    if not bot:
+        return {'error': 'bot not initialized'}, 503
+    try:
+        me = cached_me()
+        webhook_info = cached_webhook_info()
+        return {
+            'username': me.username,
+            'bot_id': me.id,
+            'webhook_url': webhook_info.url,
+            'pending_update_count': webhook_info.pending_update_count,
+            'last_error_message': webhook_info.last_error_message
         }
+    except Exception as e:
+        return {'error': str(e)}, 500
+
+# The home payload never changes - serialize it once at import time
+HOME_BYTES = orjson.dumps({
+    'status': 'online',
+    'service': 'Large File Storage Bot',
+    'description': 'Store and share files up to 10GB+',
+    'max_file_size': '10GB+ (using Telegram chunks)',
+    'endpoints': {
+        'upload': '/upload',
+        'download': '/download/<file_id>',
+        'file_info': '/files/<file_id>/info',
+        'list_files': '/files',
+        'health': '/health'
     }
+})
 
-if __name__ == '__main__':
-    # Create upload directory if it doesn't exist
-    if not os.path.exists(UPLOAD_FOLDER):
-        os.makedirs(UPLOAD_FOLDER)
-    
+@app.route('/')
+def home():
+    return Response(HOME_BYTES, mimetype='application/json')
+
+def startup():
+    """One-time process startup: webhook registration + banner"""
     logger.info(f"🚀 Starting Large File Storage Bot on port {PORT}")
     logger.info(f"📁 Upload folder: {UPLOAD_FOLDER}")
     logger.info(f"🌐 Base URL: {BASE_URL}")
     logger.info(f"⚡ Max chunk size: {MAX_CHUNK_SIZE/1024/1024/1024:.1f}GB")
     logger.info(f"📊 Supported file sizes: Up to 10GB+")
-    
+
     # Setup webhook instead of polling
-    webhook_success = setup_webhook()
-    
-    if webhook_success:
+    if setup_webhook():
         logger.info("✅ Webhook setup completed successfully")
     else:
         logger.error("❌ Webhook setup failed")
-    
-    app.run(host='0.0.0.0', port=PORT, debug=False, threaded=True)
+
+# Run startup at import time so gunicorn workers are fully initialized;
+# the __main__ block below is only a local development fallback
+startup()
+
+if __name__ == '__main__':
+    # waitress instead of Flask's dev server: the dev server serializes
+    # streaming responses, so parallel Range connections from one video
+    # client would stall each other even locally
+    from waitress import serve
+    serve(app, host='0.0.0.0', port=PORT, threads=32, channel_timeout=3600)
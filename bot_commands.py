@@ -1,7 +1,6 @@
 import os
-import requests
-from telebot import types
-from app import bot, process_uploaded_file, file_metadata
+import shutil
+from app import bot, process_uploaded_file, file_metadata, HTTP_SESSION, EXECUTOR, STREAM_CHUNK
 from config import Config
 import uuid
 
@@ -35,8 +34,9 @@ I'll split large files into chunks automatically and provide you with a direct d
 def handle_upload_command(message):
     """Handle the upload command"""
     # Check if user provided a URL
-    if len(message.text.split()) > 1:
-        url = message.text.split()[1]
+    _, _, url = message.text.partition(' ')
+    url = url.strip()
+    if url:
         handle_url_upload(message, url)
     else:
         # Ask for URL
@@ -107,7 +107,11 @@ def handle_url_upload(message, url):
 
 @bot.message_handler(content_types=['document'])
 def handle_document(message):
-    """Handle document messages (file uploads)"""
+    """Handle document messages - the transfer runs on the worker pool"""
+    EXECUTOR.submit(_process_document, message)
+
+def _process_document(message):
+    """Download and store an incoming document (worker thread)"""
     try:
         # Get file information
         file_info = bot.get_file(message.document.file_id)
@@ -117,16 +121,18 @@ def handle_document(message):
         bot.send_message(message.chat.id, "📥 Downloading your file...")
         file_url = f"https://api.telegram.org/file/bot{Config.TELEGRAM_BOT_TOKEN}/{file_info.file_path}"
         
-        # Download file
-        response = requests.get(file_url)
+        # Stream the file to disk instead of buffering it in memory
+        response = HTTP_SESSION.get(file_url, stream=True)
         if response.status_code != 200:
             bot.send_message(message.chat.id, "❌ Failed to download file. Please try again.")
             return
-        
-        # Save file temporarily
+
+        # Save file temporarily - copyfileobj keeps the byte loop in C
+        # instead of one Python frame per chunk
         temp_path = os.path.join(Config.UPLOAD_FOLDER, file_name)
+        response.raw.decode_content = True
         with open(temp_path, 'wb') as f:
-            f.write(response.content)
+            shutil.copyfileobj(response.raw, f, length=STREAM_CHUNK)
         
         # Process the file
         bot.send_message(message.chat.id, "⚙️ Processing your file...")